@@ -1,37 +1,56 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Simple Audio to SRT Subtitle Generator using OpenAI Whisper
+Simple Audio to SRT Subtitle Generator using Whisper (faster-whisper / CTranslate2)
 Transcribes MP3 audio files to SRT subtitle format for Spanish (Latin American) content.
-  pip install openai-whisper
+  pip install faster-whisper
   python simple_transcript.py
 """
 
 import os
-import whisper
-import re
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from pathlib import Path
-from datetime import timedelta
+from srt_kernels import split_hms
+from whisper_pool import compute_type_for, cuda_device_count, default_device, get_model
 
 class SimpleAudioToSRTConverter:
-    def __init__(self, media_folder="media", output_folder="srt_spanish"):
+    def __init__(self, media_folder="media", output_folder="srt_spanish", model_name="base", device_index=0):
         """
         Initialize the converter with input and output folders.
         
         Args:
             media_folder (str): Path to folder containing MP3 files
             output_folder (str): Path to folder where SRT files will be saved
+            model_name (str): Whisper model size to load
+            device_index (int): GPU to run on when CUDA is available
         """
         self.media_folder = Path(media_folder)
         self.output_folder = Path(output_folder)
+        self.model_name = model_name
+        self.device_index = device_index
+        self._model = None
         
         # Create output folder if it doesn't exist
         self.output_folder.mkdir(exist_ok=True)
         
-        print("Loading Whisper model...")
-        # Load Whisper model (will download on first run)
-        self.model = whisper.load_model("base")
-        print("Whisper model loaded successfully!")
+        # Use the GPU with float16 weights when CUDA is available, int8 on CPU otherwise
+        self.device = default_device()
+    
+    @property
+    def model(self):
+        """
+        Whisper model, loaded on first use so worker pools don't pay for one in the parent.
+        
+        Returns:
+            WhisperModel: Model shared within the process
+        """
+        if self._model is None:
+            print(f"Loading Whisper model on {self.device} ({compute_type_for(self.device)})...")
+            # Load Whisper model (will download on first run, shared within the process)
+            self._model = get_model(self.model_name, self.device, self.device_index)
+            print("Whisper model loaded successfully!")
+        return self._model
     
     def format_time(self, seconds):
         """
@@ -43,40 +62,33 @@ class SimpleAudioToSRTConverter:
         Returns:
             str: Formatted time string
         """
-        td = timedelta(seconds=seconds)
-        hours = int(td.total_seconds() // 3600)
-        minutes = int((td.total_seconds() % 3600) // 60)
-        seconds = td.total_seconds() % 60
-        milliseconds = int((seconds % 1) * 1000)
-        seconds = int(seconds)
-        
+        hours, minutes, seconds, milliseconds = split_hms(seconds)
         return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
     
-    def create_srt_content(self, segments):
+    def write_srt(self, segments, fp):
         """
-        Create SRT content from Whisper segments.
+        Write Whisper segments to a file in SRT format as they are produced.
         
         Args:
-            segments (list): List of Whisper segments
+            segments (iterable): Whisper segments with start, end and text
+            fp: Text file object to write to
             
         Returns:
-            str: SRT formatted content
+            int: Number of segments written
         """
-        srt_content = ""
+        count = 0
         
         for i, segment in enumerate(segments, 1):
-            start_time = self.format_time(segment['start'])
-            end_time = self.format_time(segment['end'])
+            start_time = self.format_time(segment.start)
+            end_time = self.format_time(segment.end)
             
             # Clean and format text
-            text = segment['text'].strip()
-            text = re.sub(r'\s+', ' ', text)  # Remove extra whitespace
+            text = ' '.join(segment.text.split())  # Remove extra whitespace
             
-            srt_content += f"{i}\n"
-            srt_content += f"{start_time} --> {end_time}\n"
-            srt_content += f"{text}\n\n"
+            fp.write(f"{i}\n{start_time} --> {end_time}\n{text}\n\n")
+            count = i
         
-        return srt_content
+        return count
     
     def process_audio_file(self, mp3_path):
         """
@@ -93,25 +105,35 @@ class SimpleAudioToSRTConverter:
             
             # Transcribe audio using Whisper
             print("Transcribing audio with Whisper...")
-            result = self.model.transcribe(
+            segments, info = self.model.transcribe(
                 str(mp3_path),
                 language="es",  # Spanish
-                task="transcribe"
+                vad_filter=True,  # Skip silent regions with Silero VAD
+                vad_parameters=dict(min_silence_duration_ms=500),
+                beam_size=1,
+                # Guard against hallucinated repetition loops
+                condition_on_previous_text=False,
+                no_repeat_ngram_size=5,
+                repetition_penalty=1.1
             )
             
-            # Create SRT content from segments
-            segments = result['segments']
-            srt_content = self.create_srt_content(segments)
-            
-            # Save SRT file
+            # Save SRT file, writing segments as they are decoded
             srt_filename = mp3_path.stem + ".srt"
             srt_path = self.output_folder / srt_filename
             
-            with open(srt_path, 'w', encoding='utf-8') as f:
-                f.write(srt_content)
+            # Decoding happens while writing, so write to a temporary file and only
+            # replace the SRT once every segment was written
+            tmp_path = srt_path.with_name(srt_path.name + ".tmp")
+            try:
+                with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    segment_count = self.write_srt(segments, f)
+                tmp_path.replace(srt_path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
             
             print(f"SRT file created: {srt_path}")
-            print(f"Transcription completed with {len(segments)} segments")
+            print(f"Transcription completed with {segment_count} segments")
             
             return True
             
@@ -131,13 +153,66 @@ class SimpleAudioToSRTConverter:
         
         print(f"Found {len(mp3_files)} MP3 file(s) to process")
         
+        if self.device == "cuda":
+            # One worker per GPU, each worker keeps its own device for its lifetime
+            max_workers = min(len(mp3_files), cuda_device_count())
+        else:
+            # Each CTranslate2 model runs 4 threads on CPU
+            max_workers = min(len(mp3_files), max(1, (os.cpu_count() or 1) // 4))
+        
         successful = 0
-        for mp3_file in mp3_files:
-            if self.process_audio_file(mp3_file):
-                successful += 1
+        if max_workers <= 1:
+            for mp3_file in mp3_files:
+                if self.process_audio_file(mp3_file):
+                    successful += 1
+        else:
+            print(f"Transcribing with {max_workers} worker processes")
+            # Spawn rather than fork so workers never inherit the parent's CUDA state
+            ctx = get_context("spawn")
+            device_queue = ctx.Queue()
+            for device_index in range(max_workers):
+                device_queue.put(device_index if self.device == "cuda" else 0)
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=ctx,
+                initializer=_init_worker,
+                initargs=(self.output_folder, self.model_name, device_queue)
+            ) as executor:
+                successful = sum(executor.map(_transcribe_one, mp3_files))
         
         print(f"\nProcessing complete: {successful}/{len(mp3_files)} files processed successfully")
 
+# Converter owned by a worker process, set up once by _init_worker
+_worker_converter = None
+
+def _init_worker(output_folder, model_name, device_queue):
+    """
+    Set up a worker process with the GPU it will use for every file it handles.
+    
+    Args:
+        output_folder (Path): Path to folder where SRT files will be saved
+        model_name (str): Whisper model size to load
+        device_queue: Queue holding one device index per worker
+    """
+    global _worker_converter
+    _worker_converter = SimpleAudioToSRTConverter(
+        output_folder=output_folder,
+        model_name=model_name,
+        device_index=device_queue.get()
+    )
+
+def _transcribe_one(mp3_path):
+    """
+    Transcribe a single MP3 file in a worker process.
+    
+    Args:
+        mp3_path (Path): Path to MP3 file
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return _worker_converter.process_audio_file(mp3_path)
+
 def main():
     """Main function to run the simple audio to SRT converter."""
     print("Simple Audio to SRT Subtitle Generator using Whisper")
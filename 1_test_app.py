@@ -52,10 +52,10 @@ def test_environment():
     # Check Python packages
     print("\nChecking Python packages:")
     try:
-        import whisper
-        print("  ✓ openai-whisper")
+        import faster_whisper
+        print("  ✓ faster-whisper")
     except ImportError:
-        print("  ✗ openai-whisper (install with: pip install openai-whisper)")
+        print("  ✗ faster-whisper (install with: pip install faster-whisper)")
     
     try:
         import speech_recognition
@@ -64,10 +64,10 @@ def test_environment():
         print("  ✗ SpeechRecognition (install with: pip install SpeechRecognition)")
     
     try:
-        from pydub import AudioSegment
-        print("  ✓ pydub")
+        import av
+        print("  ✓ av")
     except ImportError:
-        print("  ✗ pydub (install with: pip install pydub)")
+        print("  ✗ av (install with: pip install av)")
     
     print("\n" + "=" * 50)
     print("Environment test completed!")
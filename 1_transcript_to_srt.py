@@ -6,13 +6,20 @@ Transcribes MP3 audio files to SRT subtitle format for Spanish (Latin American)
 """
 
 import os
+import av
+import numpy as np
 import speech_recognition as sr
-from pydub import AudioSegment
-from pydub.silence import split_on_silence
 import pysrt
-import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from srt_kernels import silent_frames, split_ms
+
+# Audio is decoded to 16 kHz mono, the rate used for speech recognition
+SAMPLE_RATE = 16000
+
+# Concurrent Google Speech Recognition requests per file
+MAX_RECOGNITION_WORKERS = 8
 
 class AudioToSRTConverter:
     def __init__(self, media_folder="media", output_folder="srt_spanish"):
@@ -35,53 +42,68 @@ class AudioToSRTConverter:
         self.recognizer.dynamic_energy_threshold = True
         self.recognizer.pause_threshold = 0.8
         
-    def convert_mp3_to_wav(self, mp3_path):
+    def load_audio(self, mp3_path):
         """
-        Convert MP3 file to WAV format for better speech recognition.
+        Decode an MP3 file in memory to 16 kHz mono PCM.
         
         Args:
             mp3_path (Path): Path to MP3 file
             
         Returns:
-            Path: Path to temporary WAV file
+            numpy.ndarray: Decoded int16 samples, or None on error
         """
         try:
-            print(f"Converting {mp3_path.name} to WAV format...")
-            audio = AudioSegment.from_mp3(mp3_path)
+            print(f"Decoding {mp3_path.name}...")
+            resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+            frames = []
+            
+            with av.open(str(mp3_path)) as container:
+                for frame in container.decode(audio=0):
+                    frames.extend(resampler.resample(frame))
+                frames.extend(resampler.resample(None))  # Flush buffered samples
             
-            # Export as WAV
-            wav_path = mp3_path.with_suffix('.wav')
-            audio.export(wav_path, format="wav")
-            print(f"Conversion completed: {wav_path.name}")
-            return wav_path
+            samples = np.concatenate([frame.to_ndarray().ravel() for frame in frames])
+            print(f"Decoding completed: {len(samples) / SAMPLE_RATE:.1f}s of audio")
+            return samples
             
         except Exception as e:
-            print(f"Error converting MP3 to WAV: {e}")
+            print(f"Error decoding MP3: {e}")
             return None
     
-    def split_audio_on_silence(self, audio_path, min_silence_len=500, silence_thresh=-40):
+    def split_audio_on_silence(self, samples, min_silence_len=500, silence_thresh=-40, keep_silence=100):
         """
         Split audio into chunks based on silence detection.
         
         Args:
-            audio_path (Path): Path to audio file
+            samples (numpy.ndarray): Decoded int16 samples
             min_silence_len (int): Minimum silence length in milliseconds
-            silence_thresh (int): Silence threshold in dB
+            silence_thresh (int): Silence threshold in dBFS
+            keep_silence (int): Silence kept around each chunk in milliseconds
             
         Returns:
-            list: List of audio chunks
+            list: List of audio chunks (views into samples)
         """
         try:
             print("Splitting audio into chunks based on silence...")
-            audio = AudioSegment.from_wav(audio_path)
             
-            # Split audio on silence
-            chunks = split_on_silence(
-                audio,
-                min_silence_len=min_silence_len,
-                silence_thresh=silence_thresh,
-                keep_silence=100  # Keep 100ms of silence for natural breaks
-            )
+            # Detect silence on 1 ms frames
+            frame_len = SAMPLE_RATE // 1000
+            thresh = 10 ** (silence_thresh / 20) * 32768
+            silent = silent_frames(samples, frame_len, min_silence_len, thresh)
+            
+            # Non-silent [start, end) frame ranges
+            edges = np.flatnonzero(np.diff(np.concatenate(([True], silent, [True])).astype(np.int8)))
+            
+            # Keep some silence around each range, splitting overlaps halfway
+            bounds = []
+            for start, end in edges.reshape(-1, 2):
+                start = max(0, start - keep_silence)
+                end = min(len(silent), end + keep_silence)
+                if bounds and bounds[-1][1] > start:
+                    start = bounds[-1][1] = (bounds[-1][1] + start) // 2
+                bounds.append([start, end])
+            
+            chunks = [samples[start * frame_len:end * frame_len] for start, end in bounds]
             
             print(f"Audio split into {len(chunks)} chunks")
             return chunks
@@ -95,7 +117,7 @@ class AudioToSRTConverter:
         Transcribe a single audio chunk.
         
         Args:
-            chunk: AudioSegment chunk
+            chunk (numpy.ndarray): Chunk samples
             chunk_index (int): Index of the chunk
             chunk_duration (int): Duration of the chunk in milliseconds
             
@@ -103,40 +125,29 @@ class AudioToSRTConverter:
             dict: Dictionary with transcription text and timing info
         """
         try:
-            # Export chunk to temporary WAV file
-            temp_wav = f"temp_chunk_{chunk_index}.wav"
-            chunk.export(temp_wav, format="wav")
+            # Wrap the raw 16-bit PCM samples directly, no WAV encoding needed
+            audio_data = sr.AudioData(chunk.tobytes(), SAMPLE_RATE, 2)
+            
+            # Use Google Speech Recognition with Spanish language
+            text = self.recognizer.recognize_google(
+                audio_data, 
+                language="es-419"  # Spanish (Latin American)
+            )
+            
+            return {
+                'text': text,
+                'start_time': chunk_index * chunk_duration,
+                'end_time': (chunk_index + 1) * chunk_duration
+            }
             
-            # Recognize speech
-            with sr.AudioFile(temp_wav) as source:
-                audio_data = self.recognizer.record(source)
-                
-                # Use Google Speech Recognition with Spanish language
-                text = self.recognizer.recognize_google(
-                    audio_data, 
-                    language="es-419"  # Spanish (Latin American)
-                )
-                
-                # Clean up temporary file
-                os.remove(temp_wav)
-                
-                return {
-                    'text': text,
-                    'start_time': chunk_index * chunk_duration,
-                    'end_time': (chunk_index + 1) * chunk_duration
-                }
-                
         except sr.UnknownValueError:
             print(f"Chunk {chunk_index}: Speech not recognized")
-            os.remove(temp_wav) if os.path.exists(temp_wav) else None
             return None
         except sr.RequestError as e:
             print(f"Chunk {chunk_index}: Could not request results; {e}")
-            os.remove(temp_wav) if os.path.exists(temp_wav) else None
             return None
         except Exception as e:
             print(f"Chunk {chunk_index}: Error during transcription: {e}")
-            os.remove(temp_wav) if os.path.exists(temp_wav) else None
             return None
     
     def format_time(self, milliseconds):
@@ -149,14 +160,7 @@ class AudioToSRTConverter:
         Returns:
             str: Formatted time string
         """
-        seconds = milliseconds // 1000
-        milliseconds = milliseconds % 1000
-        
-        hours = seconds // 3600
-        seconds = seconds % 3600
-        minutes = seconds // 60
-        seconds = seconds % 60
-        
+        hours, minutes, seconds, milliseconds = split_ms(milliseconds)
         return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
     
     def create_srt_content(self, transcriptions):
@@ -169,7 +173,7 @@ class AudioToSRTConverter:
         Returns:
             str: SRT formatted content
         """
-        srt_content = ""
+        blocks = []
         
         for i, trans in enumerate(transcriptions, 1):
             if trans and trans['text'].strip():
@@ -177,14 +181,11 @@ class AudioToSRTConverter:
                 end_time = self.format_time(trans['end_time'])
                 
                 # Clean and format text
-                text = trans['text'].strip()
-                text = re.sub(r'\s+', ' ', text)  # Remove extra whitespace
+                text = ' '.join(trans['text'].split())  # Remove extra whitespace
                 
-                srt_content += f"{i}\n"
-                srt_content += f"{start_time} --> {end_time}\n"
-                srt_content += f"{text}\n\n"
+                blocks.append(f"{i}\n{start_time} --> {end_time}\n{text}\n\n")
         
-        return srt_content
+        return "".join(blocks)
     
     def process_audio_file(self, mp3_path):
         """
@@ -199,28 +200,31 @@ class AudioToSRTConverter:
         try:
             print(f"\nProcessing: {mp3_path.name}")
             
-            # Convert MP3 to WAV
-            wav_path = self.convert_mp3_to_wav(mp3_path)
-            if not wav_path:
+            # Decode MP3 in memory
+            samples = self.load_audio(mp3_path)
+            if samples is None:
                 return False
             
             # Split audio into chunks
-            chunks = self.split_audio_on_silence(wav_path)
+            chunks = self.split_audio_on_silence(samples)
             if not chunks:
                 print("No audio chunks found")
                 return False
             
             # Calculate chunk duration
-            total_duration = sum(len(chunk) for chunk in chunks)
+            total_duration = sum(len(chunk) for chunk in chunks) * 1000 // SAMPLE_RATE
             chunk_duration = total_duration // len(chunks)
             
-            print("Transcribing audio chunks...")
-            transcriptions = []
-            
-            for i, chunk in enumerate(chunks):
-                print(f"Processing chunk {i+1}/{len(chunks)}...")
-                transcription = self.transcribe_chunk(chunk, i, chunk_duration)
-                transcriptions.append(transcription)
+            # Recognition requests are network bound, overlap them in threads.
+            # The recognizer is shared: recognize_google() doesn't modify it.
+            print(f"Transcribing {len(chunks)} audio chunks...")
+            with ThreadPoolExecutor(max_workers=MAX_RECOGNITION_WORKERS) as executor:
+                transcriptions = list(executor.map(
+                    self.transcribe_chunk,
+                    chunks,
+                    range(len(chunks)),
+                    [chunk_duration] * len(chunks)
+                ))
             
             # Create SRT content
             srt_content = self.create_srt_content(transcriptions)
@@ -234,10 +238,6 @@ class AudioToSRTConverter:
             
             print(f"SRT file created: {srt_path}")
             
-            # Clean up temporary WAV file
-            if wav_path.exists():
-                wav_path.unlink()
-            
             return True
             
         except Exception as e:
@@ -256,10 +256,11 @@ class AudioToSRTConverter:
         
         print(f"Found {len(mp3_files)} MP3 file(s) to process")
         
-        successful = 0
-        for mp3_file in mp3_files:
-            if self.process_audio_file(mp3_file):
-                successful += 1
+        # Files are independent, process them in parallel
+        # Each process already runs MAX_RECOGNITION_WORKERS recognition threads
+        max_workers = min(len(mp3_files), max(1, (os.cpu_count() or 1) // 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            successful = sum(executor.map(self.process_audio_file, mp3_files))
         
         print(f"\nProcessing complete: {successful}/{len(mp3_files)} files processed successfully")
 
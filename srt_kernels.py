@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Numeric kernels shared by the SRT generators
+Timestamp splitting and silence detection, compiled with Numba.
+Importing this module JIT-compiles the kernels on first use. To skip the
+JIT warm-up, build them ahead of time into a native _srt_kernels_aot
+extension, which this module uses for as long as it is newer than this file:
+  python srt_kernels.py
+"""
+
+import os
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba is optional, run the kernels as plain Python without it
+    def njit(*args, **kwargs):
+        return lambda func: func
+    prange = range
+
+# Frames whose energy is computed together, bounds the float64 scratch per block
+ENERGY_BLOCK_FRAMES = 4096
+
+@njit(cache=True, fastmath=True)
+def split_hms(seconds):
+    """Split seconds into (hours, minutes, seconds, milliseconds)."""
+    total_ms = int(round(seconds * 1000))
+    ms = total_ms % 1000
+    s = (total_ms // 1000) % 60
+    m = (total_ms // 60000) % 60
+    h = total_ms // 3600000
+    return h, m, s, ms
+
+@njit(cache=True)
+def split_ms(total_ms):
+    """Split milliseconds into (hours, minutes, seconds, milliseconds)."""
+    ms = total_ms % 1000
+    s = (total_ms // 1000) % 60
+    m = (total_ms // 60000) % 60
+    h = total_ms // 3600000
+    return h, m, s, ms
+
+@njit(cache=True, parallel=True, fastmath=True)
+def silent_frames(samples, frame_len, win, thresh):
+    """
+    Flag the frames covered by a window of win frames whose RMS is at or below thresh.
+    
+    Args:
+        samples (numpy.ndarray): Mono int16 samples
+        frame_len (int): Samples per frame
+        win (int): Window length in frames
+        thresh (float): RMS threshold in sample units
+        
+    Returns:
+        numpy.ndarray: Boolean silence flag per frame
+    """
+    n_frames = samples.size // frame_len
+    if n_frames < win:
+        return np.zeros(n_frames, np.bool_)
+    
+    # Energy per frame in bounded blocks, then windowed RMS from a running sum
+    energy = np.empty(n_frames)
+    n_blocks = (n_frames + ENERGY_BLOCK_FRAMES - 1) // ENERGY_BLOCK_FRAMES
+    for b in prange(n_blocks):
+        first = b * ENERGY_BLOCK_FRAMES
+        last = min(first + ENERGY_BLOCK_FRAMES, n_frames)
+        block = samples[first * frame_len:last * frame_len].astype(np.float64)
+        energy[first:last] = (block * block).reshape((last - first, frame_len)).sum(axis=1)
+    cumulative = np.zeros(n_frames + 1)
+    cumulative[1:] = np.cumsum(energy)
+    rms = np.sqrt((cumulative[win:] - cumulative[:-win]) / (win * frame_len))
+    
+    # Every frame inside a silent window is silent
+    starts = np.flatnonzero(rms <= thresh)
+    coverage = np.zeros(n_frames + 1, np.int64)
+    coverage[starts] += 1
+    coverage[starts + win] -= 1
+    return np.cumsum(coverage[:-1]) > 0
+
+# Use the ahead-of-time build unless this file was edited after it was compiled
+if __name__ != "__main__":
+    try:
+        import _srt_kernels_aot
+    except ImportError:
+        pass
+    else:
+        if os.path.getmtime(_srt_kernels_aot.__file__) >= os.path.getmtime(__file__):
+            split_hms = _srt_kernels_aot.split_hms
+            split_ms = _srt_kernels_aot.split_ms
+            silent_frames = _srt_kernels_aot.silent_frames
+
+def main():
+    """Compile the kernels ahead of time into a native _srt_kernels_aot extension."""
+    from numba.pycc import CC
+    
+    cc = CC('_srt_kernels_aot')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export('split_hms', 'UniTuple(i8, 4)(f8)')(split_hms.py_func)
+    cc.export('split_ms', 'UniTuple(i8, 4)(i8)')(split_ms.py_func)
+    cc.export('silent_frames', 'b1[:](i2[:], i8, i8, f8)')(silent_frames.py_func)
+    cc.compile()
+    print(f"Compiled _srt_kernels_aot extension in {cc.output_dir}")
+
+if __name__ == "__main__":
+    main()
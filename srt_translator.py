@@ -10,6 +10,9 @@ and saves the translated files to srt_english folder while preserving the SRT fo
 import os
 import re
 import sys
+import io
+import mmap
+import asyncio
 from pathlib import Path
 from typing import List, Tuple, Optional
 import argparse
@@ -26,6 +29,15 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+# Maximum number of translation requests in flight, shared by all files
+MAX_CONCURRENT_REQUESTS = 8
+
+# Maximum number of SRT files translated concurrently
+MAX_CONCURRENT_FILES = 16
+
+# Blank lines separating SRT blocks
+SRT_BLOCK_SEPARATOR_RE = re.compile(r'\n\s*\n')
+
 
 class SRTTranslator:
     """Class to handle SRT file translation while preserving format."""
@@ -41,8 +53,9 @@ class SRTTranslator:
         self.source_lang = source_lang
         self.target_lang = target_lang
         self.translator = None
+        self._request_semaphore = None
         
-        # Try to initialize Google Translate
+        # Try to initialize Google Translate (async client)
         if GOOGLE_TRANSLATE_AVAILABLE:
             try:
                 self.translator = Translator()
@@ -52,8 +65,8 @@ class SRTTranslator:
                 self.translator = None
         
         if not self.translator:
-            print("⚠ No translation service available. Install googletrans==4.0.0rc1")
-            print("  pip install googletrans==4.0.0rc1")
+            print("⚠ No translation service available. Install googletrans==4.0.2")
+            print("  pip install googletrans==4.0.2")
     
     def parse_srt(self, content: str) -> List[Tuple[int, str, str, str]]:
         """
@@ -65,61 +78,94 @@ class SRTTranslator:
         Returns:
             List of tuples: (index, timestamp, text, empty_line)
         """
-        # Split content into subtitle blocks
-        blocks = re.split(r'\n\s*\n', content.strip())
         subtitles = []
         
-        for block in blocks:
-            if not block.strip():
-                continue
-                
-            lines = block.strip().split('\n')
-            if len(lines) >= 3:
+        # Split content into subtitle blocks
+        for block in SRT_BLOCK_SEPARATOR_RE.split(content.strip()):
+            # Index line, timestamp line and the remaining text lines
+            lines = block.strip().split('\n', 2)
+            if len(lines) == 3:
                 try:
-                    index = int(lines[0])
-                    timestamp = lines[1]
-                    text = '\n'.join(lines[2:])
-                    empty_line = ''
-                    subtitles.append((index, timestamp, text, empty_line))
+                    subtitles.append((int(lines[0]), lines[1], lines[2], ''))
                 except ValueError:
                     # Skip malformed blocks
                     continue
         
         return subtitles
     
-    def translate_text(self, text: str) -> str:
+    def read_srt(self, input_file: Path) -> str:
         """
-        Translate text using available translation service.
+        Read an SRT file through a read-only memory map.
         
         Args:
-            text: Text to translate
+            input_file: Path to SRT file
             
         Returns:
-            Translated text
+            File content with Unix line endings
         """
-        if not self.translator:
-            return text  # Return original if no translator available
+        with open(input_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ''  # Empty files can't be mapped
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = mm[:].decode('utf-8')
         
-        try:
-            # Clean up text for translation
-            clean_text = text.strip()
-            if not clean_text:
-                return text
+        return content.replace('\r\n', '\n')
+    
+    async def _translate_request(self, text: str) -> str:
+        """
+        Send one translation request, waiting for a free request slot.
+        
+        Args:
+            text: Text to translate
             
-            # Translate the text
-            result = self.translator.translate(
-                clean_text, 
-                src=self.source_lang, 
+        Returns:
+            Translated text
+        """
+        async with self._request_semaphore:
+            result = await self.translator.translate(
+                text,
+                src=self.source_lang,
                 dest=self.target_lang
             )
+        
+        return result.text
+    
+    async def translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Translate several texts concurrently, one request per text.
+        
+        Args:
+            texts: Texts to translate
             
-            return result.text
-            
-        except Exception as e:
-            print(f"⚠ Translation error: {e}")
-            return text  # Return original text on error
+        Returns:
+            Translated texts in the same order as the input
+        """
+        translated = list(texts)
+        if not self.translator:
+            return translated  # Return originals if no translator available
+        
+        # Created here so it belongs to the running event loop
+        if self._request_semaphore is None:
+            self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        # Empty texts are returned unchanged
+        pending = [i for i, text in enumerate(texts) if text.strip()]
+        
+        results = await asyncio.gather(
+            *[self._translate_request(texts[i].strip()) for i in pending],
+            return_exceptions=True
+        )
+        
+        for i, result in zip(pending, results):
+            if isinstance(result, Exception):
+                print(f"⚠ Translation error: {result}")  # Keep the original text
+            else:
+                translated[i] = result
+        
+        return translated
     
-    def translate_srt_content(self, content: str) -> str:
+    async def translate_srt_content(self, content: str) -> str:
         """
         Translate SRT content while preserving format.
         
@@ -130,20 +176,28 @@ class SRTTranslator:
             Translated SRT content
         """
         subtitles = self.parse_srt(content)
-        translated_blocks = []
         
-        for index, timestamp, text, empty_line in subtitles:
-            # Translate the subtitle text
-            translated_text = self.translate_text(text)
+        texts = [text.strip() for _, _, text, _ in subtitles]
+        
+        # Translate each distinct text once
+        unique_texts = list(dict.fromkeys(texts))
+        translations = dict(zip(unique_texts, await self.translate_batch(unique_texts)))
+        output = io.StringIO()
+        
+        for i, ((index, timestamp, _, _), text) in enumerate(zip(subtitles, texts)):
+            translated_text = translations[text]
+            
+            # Separate blocks with double newlines
+            if i:
+                output.write('\n\n')
             
             # Reconstruct the block
-            block = f"{index}\n{timestamp}\n{translated_text}"
-            translated_blocks.append(block)
+            output.write(f"{index}\n{timestamp}\n{translated_text}")
         
-        # Join blocks with double newlines
-        return '\n\n'.join(translated_blocks) + '\n'
+        output.write('\n')
+        return output.getvalue()
     
-    def translate_file(self, input_file: Path, output_file: Path) -> bool:
+    async def translate_file(self, input_file: Path, output_file: Path) -> bool:
         """
         Translate a single SRT file.
         
@@ -158,11 +212,10 @@ class SRTTranslator:
             print(f"Translating: {input_file.name}")
             
             # Read input file
-            with open(input_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self.read_srt(input_file)
             
             # Translate content
-            translated_content = self.translate_srt_content(content)
+            translated_content = await self.translate_srt_content(content)
             
             # Ensure output directory exists
             output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -178,9 +231,9 @@ class SRTTranslator:
             print(f"✗ Error translating {input_file.name}: {e}")
             return False
     
-    def translate_directory(self, input_dir: Path, output_dir: Path) -> Tuple[int, int]:
+    async def translate_directory(self, input_dir: Path, output_dir: Path) -> Tuple[int, int]:
         """
-        Translate all SRT files in a directory.
+        Translate all SRT files in a directory concurrently.
         
         Args:
             input_dir: Input directory containing SRT files
@@ -205,18 +258,23 @@ class SRTTranslator:
         print(f"Output: {output_dir}")
         print("-" * 50)
         
-        successful = 0
         total = len(srt_files)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FILES)
         
-        for srt_file in srt_files:
-            # Create output file path
-            output_file = output_dir / srt_file.name
-            
-            # Translate the file
-            if self.translate_file(srt_file, output_file):
-                successful += 1
+        async def translate_limited(srt_file: Path) -> bool:
+            async with semaphore:
+                # Create output file path and translate the file
+                return await self.translate_file(srt_file, output_dir / srt_file.name)
+        
+        results = await asyncio.gather(*[translate_limited(f) for f in srt_files])
+        successful = sum(results)
         
         return successful, total
+    
+    async def close(self) -> None:
+        """Close the translation service HTTP client."""
+        if self.translator:
+            await self.translator.client.aclose()
 
 
 def main():
@@ -267,12 +325,18 @@ def main():
     if not translator.translator:
         print("\n⚠ No translation service available!")
         print("To use this application, install the required package:")
-        print("pip install googletrans==4.0.0rc1")
+        print("pip install googletrans==4.0.2")
         print("\nAlternatively, you can manually translate the files.")
         sys.exit(1)
     
+    async def translate_all() -> Tuple[int, int]:
+        try:
+            return await translator.translate_directory(input_dir, output_dir)
+        finally:
+            await translator.close()
+    
     # Translate all files
-    successful, total = translator.translate_directory(input_dir, output_dir)
+    successful, total = asyncio.run(translate_all())
     
     # Print summary
     print("-" * 50)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared Whisper model pool
+Loads each faster-whisper model once per process so every converter reuses it.
+"""
+
+import os
+import functools
+import ctranslate2
+import numpy as np
+from faster_whisper import WhisperModel
+
+def cuda_device_count():
+    """Return the number of CUDA GPUs available to CTranslate2."""
+    return ctranslate2.get_cuda_device_count()
+
+def default_device():
+    """
+    Return the device to run Whisper on.
+    
+    The WHISPER_DEVICE environment variable ("cpu" or "cuda") takes precedence,
+    otherwise "cuda" is used when a CUDA GPU is visible and "cpu" if not.
+    """
+    device = os.environ.get("WHISPER_DEVICE", "").strip().lower()
+    if device:
+        return device
+    return "cuda" if cuda_device_count() > 0 else "cpu"
+
+def compute_type_for(device):
+    """Return the compute type used on a device: float16 on GPU, int8 on CPU."""
+    return "float16" if device == "cuda" else "int8"
+
+def _check_decode(model):
+    """Decode one second of silence, so missing cuBLAS/cuDNN libraries fail at load time."""
+    segments, _ = model.transcribe(np.zeros(16000, dtype=np.float32), beam_size=1)
+    list(segments)
+
+@functools.lru_cache(maxsize=4)
+def _load_model(name, device, device_index):
+    """Load a Whisper model, caching the 4 most recent (model, device) pairs."""
+    if device == "cuda":
+        try:
+            model = WhisperModel(name, device=device, device_index=device_index, compute_type=compute_type_for(device))
+            _check_decode(model)
+            return model
+        except Exception as e:
+            print(f"Could not run Whisper on CUDA ({e}), falling back to CPU")
+            return _load_model(name, "cpu", 0)
+    
+    return WhisperModel(name, device=device, device_index=device_index, compute_type=compute_type_for(device))
+
+def get_model(name="base", device=None, device_index=0):
+    """
+    Get a shared Whisper model, loading it on first use.
+    
+    Args:
+        name (str): Whisper model size
+        device (str): "cuda" or "cpu", see default_device() when None
+        device_index (int): GPU to run on when device is "cuda"
+        
+    Returns:
+        WhisperModel: Loaded model
+    """
+    if device is None:
+        device = default_device()
+    
+    return _load_model(name, device, device_index)